@@ -1,10 +1,23 @@
+import time
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fetchers.model_fetcher import ModelFetcher
+from src import logger
 from src.routes import router
 from fastapi.openapi.utils import get_openapi
 from config import settings
 
-app = FastAPI()
+
+# Load the models at startup instead of at import time
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start = time.perf_counter()
+    app.state.model_fetcher = ModelFetcher(logger=logger)
+    logger.info(f"Models ready in {time.perf_counter() - start:.3f}s")
+    yield
+
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(router=router)
 
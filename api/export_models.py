@@ -0,0 +1,19 @@
+from fetchers.compiled_model import CompiledModel
+from fetchers.model_fetcher import ModelFetcher
+import logging
+import sys
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+if __name__ == "__main__":
+    # Exports a local artifact for every model in AVAILABLE_MODELS whose artifact is missing or stale
+    model_fetcher = ModelFetcher(logger=logger, check_latest_run=True)
+    missing = [
+        model for model, loaded in model_fetcher.models.items()
+        if not isinstance(loaded, CompiledModel) or not model_fetcher.artifact_path(model).exists()
+    ]
+    if missing:
+        # An API installed without the mlflow extra cannot serve these models
+        logger.error(f"No local artifact exported for: {', '.join(missing)}")
+        sys.exit(1)
\ No newline at end of file
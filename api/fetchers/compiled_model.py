@@ -0,0 +1,385 @@
+from __future__ import annotations
+
+import numpy as np
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Mapping, Sequence, Tuple, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
+
+FeatureValue = Union[str, int, float]
+_NODE_ARRAYS = ("children_left", "children_right", "feature", "threshold", "value", "roots")
+_UNSEEN_CATEGORY = "__unseen_category__"
+
+
+class CompiledModel:
+    """A numpy-only copy of a fitted `ColumnTransformer` + `GradientBoostingRegressor` pipeline.
+
+    The categorical encoders are stored as lookup tables and the boosted trees as flat node
+    arrays, so predictions can be served without importing sklearn, pandas or mlflow.
+    Leaves point to themselves, which lets every tree be walked in lockstep for `depth` steps.
+
+    Args:
+        columns (List[str]): Input feature names, in the order the regressor expects them.
+        lookups (Dict[str, Tuple[Dict[str, float], float]]): For each encoded column, the
+            category -> encoding table and the encoding used for unseen categories.
+        nodes (Dict[str, np.ndarray]): Flat tree arrays `children_left`, `children_right`,
+            `feature`, `threshold`, `value` and the `roots` index of every tree.
+        depth (int): Maximum depth over all trees.
+        init_value (float): Raw prediction of the initial estimator.
+        learning_rate (float): Shrinkage applied to each tree.
+        run_id (str): The MLflow run the pipeline was logged by.
+    """
+    def __init__(
+            self,
+            columns: List[str],
+            lookups: Dict[str, Tuple[Dict[str, float], float]],
+            nodes: Dict[str, np.ndarray],
+            depth: int,
+            init_value: float,
+            learning_rate: float,
+            run_id: str):
+        self.columns = columns
+        self.lookups = lookups
+        self.nodes = nodes
+        self.depth = depth
+        self.init_value = init_value
+        self.learning_rate = learning_rate
+        self.run_id = run_id
+
+    def _to_matrix(self, rows: Sequence[Mapping[str, FeatureValue]]) -> np.ndarray:
+        """
+        Encodes raw feature rows into the float32 matrix seen by the trees.
+
+        Args:
+            rows (Sequence[Mapping[str, FeatureValue]]): Feature name -> value mappings.
+
+        Returns:
+            np.ndarray: Matrix of shape (len(rows), len(columns)).
+
+        Raises:
+            ValueError: If a feature is missing, a numeric feature is not a finite number
+                or a category cannot be encoded.
+        """
+        matrix = np.empty((len(rows), len(self.columns)), dtype=np.float32)
+        for i, row in enumerate(rows):
+            for j, column in enumerate(self.columns):
+                if column not in row:
+                    raise ValueError(f"Missing feature: {column}")
+                value = row[column]
+                if column in self.lookups:
+                    table, unknown = self.lookups[column]
+                    value = table.get(_category_key(value), unknown)
+                    if np.isnan(value):
+                        raise ValueError(f"Unknown category for feature {column}: {row[column]}")
+                else:
+                    try:
+                        value = float(value)
+                    except (TypeError, ValueError):
+                        raise ValueError(f"Non-numeric value for feature {column}: {row[column]}")
+                    if not np.isfinite(value):
+                        raise ValueError(f"Non-finite value for feature {column}: {row[column]}")
+                matrix[i, j] = value
+        return matrix
+
+    def predict(self, rows: Sequence[Mapping[str, FeatureValue]]) -> np.ndarray:
+        """
+        Predicts the target for each of the given rows.
+
+        Args:
+            rows (Sequence[Mapping[str, FeatureValue]]): Feature name -> value mappings.
+
+        Returns:
+            np.ndarray: One prediction per row.
+        """
+        X = self._to_matrix(rows)
+        feature = self.nodes["feature"]
+        threshold = self.nodes["threshold"]
+        left = self.nodes["children_left"]
+        right = self.nodes["children_right"]
+        node = np.broadcast_to(self.nodes["roots"], (len(X), len(self.nodes["roots"])))
+        sample = np.arange(len(X))[:, None]
+        for _ in range(self.depth):
+            go_left = X[sample, feature[node]] <= threshold[node]
+            node = np.where(go_left, left[node], right[node])
+        return self.init_value + self.learning_rate * self.nodes["value"][node].sum(axis=1)
+
+    def save(self, path: Path) -> None:
+        """
+        Writes the model to an uncompressed `.npz` artifact. The file is written next to
+        `path` and then moved into place, so a crash never leaves a truncated artifact. It
+        gets the usual umask-based permissions rather than the temporary file's 0600, so a
+        server running as another user can read it.
+
+        Args:
+            path (Path): Destination file.
+        """
+        categories, encodings, offsets, unknowns = [], [], [0], []
+        for column in self.lookups:
+            table, unknown = self.lookups[column]
+            categories.extend(table.keys())
+            encodings.extend(table.values())
+            offsets.append(len(categories))
+            unknowns.append(unknown)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        f = tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False)
+        try:
+            with f:
+                np.savez(
+                    f,
+                    columns=np.array(self.columns, dtype=str),
+                    encoded_columns=np.array(list(self.lookups), dtype=str),
+                    categories=np.array(categories, dtype=str),
+                    encodings=np.array(encodings, dtype=np.float64),
+                    category_offsets=np.array(offsets, dtype=np.int64),
+                    unknown_encodings=np.array(unknowns, dtype=np.float64),
+                    depth=np.array(self.depth),
+                    init_value=np.array(self.init_value),
+                    learning_rate=np.array(self.learning_rate),
+                    run_id=np.array(self.run_id, dtype=str),
+                    **self.nodes,
+                )
+            umask = os.umask(0)
+            os.umask(umask)
+            os.chmod(f.name, 0o644 & ~umask)
+            os.replace(f.name, path)
+        except BaseException:
+            os.unlink(f.name)
+            raise
+
+    @classmethod
+    def load(cls, path: Path) -> CompiledModel:
+        """
+        Reads a model written by `save`. No pickled objects are involved.
+
+        Args:
+            path (Path): The `.npz` artifact.
+
+        Returns:
+            CompiledModel: The loaded model.
+        """
+        with np.load(path, allow_pickle=False) as artifact:
+            offsets = artifact["category_offsets"]
+            categories = artifact["categories"].tolist()
+            encodings = artifact["encodings"].tolist()
+            lookups = {}
+            for k, column in enumerate(artifact["encoded_columns"].tolist()):
+                start, end = offsets[k], offsets[k + 1]
+                table = dict(zip(categories[start:end], encodings[start:end]))
+                lookups[column] = (table, float(artifact["unknown_encodings"][k]))
+            return cls(
+                columns=artifact["columns"].tolist(),
+                lookups=lookups,
+                nodes={key: artifact[key] for key in _NODE_ARRAYS},
+                depth=int(artifact["depth"]),
+                init_value=float(artifact["init_value"]),
+                learning_rate=float(artifact["learning_rate"]),
+                run_id=str(artifact["run_id"]),
+            )
+
+    @classmethod
+    def from_pipeline(cls, pipeline: Pipeline, run_id: str) -> CompiledModel:
+        """
+        Compiles a fitted sklearn pipeline. Only used on the MLflow fallback path, so
+        pandas and sklearn are imported here rather than at module level.
+
+        Args:
+            pipeline (Pipeline): A pipeline made of an optional `ColumnTransformer` whose
+                transformers are per-column categorical encoders or 'passthrough', followed
+                by a `GradientBoostingRegressor`.
+            run_id (str): The MLflow run the pipeline was logged by.
+
+        Returns:
+            CompiledModel: The compiled model.
+
+        Raises:
+            ValueError: If the pipeline has an unsupported structure.
+        """
+        from sklearn.compose import ColumnTransformer
+        from sklearn.dummy import DummyRegressor
+        from sklearn.ensemble import GradientBoostingRegressor
+
+        *preprocessors, (_, regressor) = pipeline.steps
+        if not isinstance(regressor, GradientBoostingRegressor):
+            raise ValueError(f"Unsupported estimator: {type(regressor).__name__}")
+        # Only a constant initial prediction can be stored as `init_value`
+        init = regressor.init_
+        if not (isinstance(init, DummyRegressor) or (isinstance(init, str) and init == "zero")):
+            raise ValueError(f"Unsupported initial estimator: {type(init).__name__}")
+        if not preprocessors:
+            columns, lookups = [str(c) for c in regressor.feature_names_in_], {}
+        elif len(preprocessors) == 1 and isinstance(preprocessors[0][1], ColumnTransformer):
+            columns, lookups = _compile_column_transformer(preprocessors[0][1])
+        else:
+            raise ValueError("Unsupported preprocessing: expected a single ColumnTransformer")
+
+        roots, offset, depth = [], 0, 0
+        arrays = {key: [] for key in _NODE_ARRAYS if key != "roots"}
+        for tree in regressor.estimators_[:, 0]:
+            tree = tree.tree_
+            index = np.arange(tree.node_count)
+            is_leaf = tree.children_left == -1
+            arrays["children_left"].append(np.where(is_leaf, index, tree.children_left) + offset)
+            arrays["children_right"].append(np.where(is_leaf, index, tree.children_right) + offset)
+            arrays["feature"].append(np.where(is_leaf, 0, tree.feature))
+            arrays["threshold"].append(np.where(is_leaf, np.inf, tree.threshold))
+            arrays["value"].append(tree.value[:, 0, 0])
+            roots.append(offset)
+            offset += tree.node_count
+            depth = max(depth, tree.max_depth)
+
+        nodes = {key: np.concatenate(values) for key, values in arrays.items()}
+        nodes["roots"] = np.array(roots, dtype=np.int64)
+        if isinstance(init, str):
+            init_value = 0.0
+        else:
+            init_value = float(init.predict(np.zeros((1, len(columns))))[0])
+        return cls(
+            columns=columns,
+            lookups=lookups,
+            nodes=nodes,
+            depth=depth,
+            init_value=init_value,
+            learning_rate=float(regressor.learning_rate),
+            run_id=run_id,
+        )
+
+
+def _category_key(value: object) -> str:
+    """
+    Returns the lookup key of a category. Numbers are keyed by their float value, so
+    `1` and `1.0` match the same category as they do in pandas.
+
+    Args:
+        value (object): The raw category.
+
+    Returns:
+        str: The lookup key.
+    """
+    if isinstance(value, (int, float, np.number)) and not isinstance(value, bool):
+        return str(float(value))
+    return str(value)
+
+
+def _fitted_categories(encoder: object, columns: List[str]) -> Dict[str, List[object]]:
+    """
+    Returns the categories an encoder saw during fit, per column.
+
+    Args:
+        encoder (object): A fitted category_encoders or sklearn encoder.
+        columns (List[str]): The columns handled by the encoder.
+
+    Returns:
+        Dict[str, List[object]]: Column name -> seen categories, for the encoded columns only.
+
+    Raises:
+        ValueError: If the encoder does not expose its categories.
+    """
+    ordinal_encoder = getattr(encoder, "ordinal_encoder", None)
+    if ordinal_encoder is not None:
+        return {
+            mapping["col"]: [c for c in mapping["mapping"].index if isinstance(c, str) or not np.isnan(c)]
+            for mapping in ordinal_encoder.category_mapping
+        }
+    if hasattr(encoder, "categories_"):
+        return {column: list(categories) for column, categories in zip(columns, encoder.categories_)}
+    raise ValueError(f"Unsupported encoder: {type(encoder).__name__}")
+
+
+def _to_dense(values: object) -> np.ndarray:
+    """
+    Converts the output of an encoder, which may be a sparse matrix or a DataFrame, to an array.
+
+    Args:
+        values (object): The encoder output.
+
+    Returns:
+        np.ndarray: The values as a dense float array.
+    """
+    if hasattr(values, "toarray"):
+        values = values.toarray()
+    return np.asarray(values, dtype=np.float64)
+
+
+def _selected_columns(selected: object, names_in: List[str]) -> List[str]:
+    """
+    Resolves the columns a `ColumnTransformer` entry was configured with to their names.
+
+    Args:
+        selected (object): The column specification of the transformer entry.
+        names_in (List[str]): The input feature names of the column transformer.
+
+    Returns:
+        List[str]: The selected column names.
+
+    Raises:
+        ValueError: If the specification is not a list of column names or indices.
+    """
+    is_list = isinstance(selected, (list, tuple, np.ndarray))
+    if not is_list or not all(isinstance(c, (str, int, np.integer)) and not isinstance(c, bool) for c in selected):
+        raise ValueError(f"Unsupported column selection: {selected!r}, expected a list of column names or indices")
+    return [c if isinstance(c, str) else names_in[c] for c in selected]
+
+
+def _compile_column_transformer(
+        transformer: object) -> Tuple[List[str], Dict[str, Tuple[Dict[str, float], float]]]:
+    """
+    Turns a fitted `ColumnTransformer` into output column names and encoder lookup tables.
+
+    Each encoder must map every input column to exactly one output column, independently
+    of the other columns, which holds for target/ordinal style encoders. Every input column
+    may be used by one transformer only, as the lookups are keyed by column name.
+
+    Args:
+        transformer (ColumnTransformer): The fitted column transformer.
+
+    Returns:
+        Tuple[List[str], Dict[str, Tuple[Dict[str, float], float]]]: The columns in output
+            order and, for the encoded ones, their category -> encoding tables plus the
+            encoding of an unseen category (NaN if the encoder rejects unseen values).
+
+    Raises:
+        ValueError: If a transformer is not supported or a column is used more than once.
+    """
+    import pandas as pd
+    from sklearn.preprocessing import FunctionTransformer
+
+    names_in = list(transformer.feature_names_in_)
+    columns, lookups = [], {}
+    for _, encoder, selected in transformer.transformers_:
+        selected = _selected_columns(selected, names_in)
+        if encoder == "drop" or not selected:
+            continue
+        columns.extend(selected)
+        if encoder == "passthrough" or (isinstance(encoder, FunctionTransformer) and encoder.func is None):
+            continue
+
+        # Columns the encoder did not fit categories for are passed through unchanged
+        seen = _fitted_categories(encoder, selected)
+        if not seen:
+            continue
+        size = max(len(categories) for categories in seen.values())
+        frame = pd.DataFrame({
+            column: seen[column] + [seen[column][0]] * (size - len(seen[column])) if column in seen else [0.0] * size
+            for column in selected
+        })
+        encoded = _to_dense(encoder.transform(frame))
+        if encoded.shape[1] != len(selected):
+            raise ValueError(f"Unsupported encoder: {type(encoder).__name__} is not one column per input")
+        try:
+            unseen = pd.DataFrame({column: [_UNSEEN_CATEGORY if column in seen else 0.0] for column in selected})
+            unknown = _to_dense(encoder.transform(unseen))[0]
+        except ValueError:
+            unknown = np.full(len(selected), np.nan)
+        for j, column in enumerate(selected):
+            if column not in seen:
+                continue
+            categories = seen[column]
+            table = {_category_key(c): float(v) for c, v in zip(categories, encoded[:len(categories), j])}
+            lookups[column] = (table, float(unknown[j]))
+    repeated = sorted({column for column in columns if columns.count(column) > 1})
+    if repeated:
+        raise ValueError(f"Unsupported preprocessing: columns used by more than one transformer: {repeated}")
+    return columns, lookups
@@ -1,24 +1,66 @@
-import mlflow
-from mlflow.entities.experiment import Experiment
-from mlflow.exceptions import MlflowException
-import pandas as pd
+from __future__ import annotations
+
+import importlib.util
+import zipfile
+from fetchers.compiled_model import CompiledModel
+from fetchers.pipeline_model import PipelineModel
 from logging import Logger
+from pathlib import Path
 from config import settings
-from typing import Dict
-from sklearn.pipeline import Pipeline
+from typing import Dict, Optional, Union, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    # mlflow, pandas and sklearn are only imported on the MLflow fallback path
+    import pandas as pd
+    from mlflow.entities.experiment import Experiment
+    from sklearn.pipeline import Pipeline
+
+API_ROOT = Path(__file__).resolve().parent.parent
+
+Model = Union[CompiledModel, PipelineModel]
+
+def _mlflow_installed() -> bool:
+    """
+    Checks whether mlflow is installed, without importing it.
+
+    Returns:
+        bool: True if mlflow can be imported.
+    """
+    return importlib.util.find_spec("mlflow") is not None
 
 class ModelFetcher:
-    def __init__(self, logger: Logger):
+    def __init__(self, logger: Logger, check_latest_run: Optional[bool] = None):
         """
         Initializes the ModelFetcher with a logger and loads models.
 
+        Models are read from local artifacts in `MODEL_ARTIFACTS_DIR`. When mlflow is installed,
+        a model whose artifact is missing or unreadable is fetched from MLflow instead and
+        exported, so the next start does not need MLflow. Artifacts older than the most recent
+        MLflow run are only replaced when `check_latest_run` is set, as querying MLflow slows
+        down every start.
+
         Args:
             logger (Logger): Logger instance for logging information.
+            check_latest_run (Optional[bool]): Whether to compare artifacts with the most recent
+                MLflow run. Defaults to the `CHECK_LATEST_RUN` setting.
         """
         self.logger = logger
-        mlflow.set_tracking_uri(settings.MLFLOW_URI)
+        self.artifacts_dir = API_ROOT / settings.MODEL_ARTIFACTS_DIR
+        self.check_latest_run = settings.CHECK_LATEST_RUN if check_latest_run is None else check_latest_run
         self.models = self.load_models()
 
+    def artifact_path(self, model: str) -> Path:
+        """
+        Returns the path of the local artifact of a model.
+
+        Args:
+            model (str): The name of the model.
+
+        Returns:
+            Path: The `.npz` artifact path.
+        """
+        return self.artifacts_dir / f"{model}.npz"
+
     def _get_experiment(self, experiment: str) -> Experiment:
         """
         Retrieves an experiment by its name.
@@ -32,6 +74,8 @@ class ModelFetcher:
         Raises:
             Exception: If the experiment is not found.
         """
+        import mlflow
+
         experiment = mlflow.get_experiment_by_name(experiment)
         if experiment:
             self.logger.info(f"Loading Model: {experiment.name} loaded")
@@ -51,13 +95,15 @@ class ModelFetcher:
         Raises:
             Exception: If no runs are found for the experiment.
         """
+        import mlflow
+
         experiment_runs = mlflow.search_runs(experiment_ids=experiment.experiment_id)
         if not experiment_runs.empty:
             self.logger.info(f"Loading Model: Runs from {experiment.name} loaded")
             return experiment_runs
         raise Exception(f"Error loading Model: No available runs for experiment {experiment.name}")
 
-    def _most_recently_model(self, experiment: Experiment) -> str:
+    def _most_recently_model(self, experiment: Experiment) -> pd.Series:
         """
         Finds the most recent run for an experiment.
 
@@ -65,7 +111,7 @@ class ModelFetcher:
             experiment (Experiment): The experiment to find the most recent run for.
 
         Returns:
-            str: The URI of the most recent model run.
+            pd.Series: The most recent run, including its `run_id` and `artifact_uri`.
 
         Raises:
             Exception: If the most recent run cannot be found.
@@ -73,34 +119,151 @@ class ModelFetcher:
         try:
             runs = self._search_run(experiment=experiment)
             most_recent_index = runs["end_time"].idxmax()
-            model_run = runs.loc[most_recent_index, "artifact_uri"]
+            model_run = runs.loc[most_recent_index]
             self.logger.info(f"Loading Model: Most recent run for {experiment.name} found")
             return model_run
         except:
             raise Exception(f"Error loading Model: Unable to find the most recent run for experiment {experiment.name}")
 
-    def load_models(self) -> Dict[str, Pipeline]:
+    def _latest_run(self, model: str) -> pd.Series:
         """
-        Loads all available models from MLflow.
+        Finds the most recent MLflow run of a model.
+
+        Args:
+            model (str): The name of the model (experiment).
 
         Returns:
-            Dict[str, Pipeline]: Dictionary of model names and their corresponding models.
+            pd.Series: The most recent run.
+
+        Raises:
+            Exception: If the run cannot be found.
+        """
+        import mlflow
+
+        mlflow.set_tracking_uri(settings.MLFLOW_URI)
+        experiment = self._get_experiment(experiment=model)
+        return self._most_recently_model(experiment=experiment)
+
+    def _load_from_mlflow(self, run: pd.Series) -> Pipeline:
+        """
+        Loads the sklearn pipeline logged by an MLflow run.
+
+        Args:
+            run (pd.Series): The run to load the model from.
+
+        Returns:
+            Pipeline: The loaded model pipeline.
+
+        Raises:
+            Exception: If the model fails to load.
+        """
+        import mlflow.sklearn
+        from mlflow.exceptions import MlflowException
+
+        try:
+            return mlflow.sklearn.load_model(f"{run['artifact_uri']}/model")
+        except MlflowException as e:
+            raise Exception(f"Failed to load model: {str(e)}")
+
+    def _export(self, model: str, run: pd.Series) -> Model:
+        """
+        Fetches a model from MLflow, compiles it and writes its local artifact. A pipeline
+        that cannot be compiled, whatever the error, is served as is.
+
+        Args:
+            model (str): The name of the model.
+            run (pd.Series): The MLflow run to export.
+
+        Returns:
+            Model: The compiled model, or the MLflow pipeline wrapped in a PipelineModel.
+        """
+        pipeline = self._load_from_mlflow(run=run)
+        try:
+            compiled = CompiledModel.from_pipeline(pipeline, run_id=run["run_id"])
+        except Exception as e:
+            self.logger.warning(f"Unable to compile model {model}, serving the MLflow pipeline: {str(e)}")
+            return PipelineModel(pipeline)
+        path = self.artifact_path(model)
+        try:
+            compiled.save(path)
+            self.logger.info(f"Model Exported: {model} to {path}")
+        except OSError as e:
+            self.logger.warning(f"Unable to export model {model} to {path}: {str(e)}")
+        return compiled
+
+    def _read_artifact(self, path: Path) -> Optional[CompiledModel]:
+        """
+        Reads a local model artifact.
+
+        Args:
+            path (Path): The `.npz` artifact.
+
+        Returns:
+            Optional[CompiledModel]: The model, or None if the artifact is missing or unreadable.
+        """
+        if not path.exists():
+            return None
+        try:
+            return CompiledModel.load(path)
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile) as e:
+            self.logger.warning(f"Unable to read model artifact {path}: {str(e)}")
+            return None
+
+    def _load_model(self, model: str) -> Model:
+        """
+        Loads a model from its local artifact, unless the artifact is unusable or, when
+        `check_latest_run` is set, MLflow has a more recent run.
+
+        Args:
+            model (str): The name of the model.
+
+        Returns:
+            Model: The loaded model.
+
+        Raises:
+            Exception: If there is no usable artifact and the model cannot be fetched from MLflow.
+        """
+        path = self.artifact_path(model)
+        compiled = self._read_artifact(path)
+        if compiled is not None and not self.check_latest_run:
+            self.logger.info(f"Model Loaded: {model} from {path}")
+            return compiled
+        if not _mlflow_installed():
+            if compiled is None:
+                raise Exception(f"Error loading Model: no local artifact for {model} and mlflow is not installed")
+            self.logger.info(f"Model Loaded: {model} from {path}")
+            return compiled
+        try:
+            run = self._latest_run(model=model)
+        except Exception as e:
+            if compiled is None:
+                raise
+            self.logger.warning(f"Unable to check MLflow for a newer {model} run, serving {path}: {str(e)}")
+            return compiled
+        if compiled is not None and compiled.run_id == run["run_id"]:
+            self.logger.info(f"Model Loaded: {model} from {path}")
+            return compiled
+        self.logger.info(f"Loading Model: local artifact for {model} is missing or stale, exporting run {run['run_id']}")
+        loaded = self._export(model=model, run=run)
+        self.logger.info(f"Model Loaded: {model}")
+        return loaded
+
+    def load_models(self) -> Dict[str, Model]:
+        """
+        Loads all available models, from up-to-date local artifacts when possible and from MLflow otherwise.
+
+        Returns:
+            Dict[str, Model]: Dictionary of model names and their corresponding models.
 
         Raises:
             Exception: If a model fails to load.
         """
         models = {}
         for model in list(settings.AVAILABLE_MODELS):
-            try:
-                experiment = self._get_experiment(experiment=model)
-                model_uri = f"{self._most_recently_model(experiment=experiment)}/model"
-                models[model] = mlflow.sklearn.load_model(model_uri)
-                self.logger.info(f"Model Loaded: {model}")
-            except MlflowException as e:
-                raise Exception(f"Failed to load model: {str(e)}")
+            models[model] = self._load_model(model=model)
         return models
-    
-    def get_model(self, model_name: str) -> Pipeline:
+
+    def get_model(self, model_name: str) -> Model:
         """
         Retrieves a loaded model by its name.
 
@@ -108,6 +271,6 @@ class ModelFetcher:
             model_name (str): The name of the model to retrieve.
 
         Returns:
-            Pipeline: The loaded model pipeline.
+            Model: The loaded model.
         """
         return self.models.get(model_name)
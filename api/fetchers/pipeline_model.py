@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+import numpy as np
+from typing import Mapping, Sequence, TYPE_CHECKING
+from fetchers.compiled_model import FeatureValue
+
+if TYPE_CHECKING:
+    from sklearn.pipeline import Pipeline
+
+
+class PipelineModel:
+    """Serves a sklearn pipeline that `CompiledModel` cannot compile, with the same interface.
+
+    Only built on the MLflow fallback path, so pandas is imported lazily.
+
+    Args:
+        pipeline (Pipeline): The fitted pipeline loaded from MLflow.
+    """
+    def __init__(self, pipeline: Pipeline):
+        self.pipeline = pipeline
+
+    def predict(self, rows: Sequence[Mapping[str, FeatureValue]]) -> np.ndarray:
+        """
+        Predicts the target for each of the given rows.
+
+        Args:
+            rows (Sequence[Mapping[str, FeatureValue]]): Feature name -> value mappings.
+
+        Returns:
+            np.ndarray: One prediction per row.
+        """
+        import pandas as pd
+
+        return np.asarray(self.pipeline.predict(pd.DataFrame(list(rows))))
@@ -1,15 +1,18 @@
+from fastapi import Request
 from fetchers.model_fetcher import ModelFetcher
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
-model_fetcher = ModelFetcher(logger=logger)
 
-def get_model_fetcher() -> ModelFetcher:
+def get_model_fetcher(request: Request) -> ModelFetcher:
     """
-    Returns the model fetcher instance.
+    Returns the model fetcher instance built by the application startup hook.
+
+    Args:
+        request (Request): The incoming request.
 
     Returns:
         ModelFetcher: The model fetcher instance.
     """
-    return model_fetcher
\ No newline at end of file
+    return request.app.state.model_fetcher
\ No newline at end of file
@@ -1,6 +1,5 @@
-from pydantic import BaseModel
-from typing import List, Union 
-import pandas as pd
+from pydantic import BaseModel, model_validator
+from typing import Dict, List, Union 
 
 class InputData(BaseModel):
     """
@@ -15,14 +14,31 @@ class InputData(BaseModel):
     features: List[str]
     values: List[Union[str, int, float]]
 
-def to_pandas_df(input_data: InputData) -> pd.DataFrame:
+    @model_validator(mode="after")
+    def check_features_match_values(self) -> "InputData":
+        """
+        Validates that there is exactly one value per feature and that feature names are unique.
+
+        Returns:
+            InputData: The validated input data.
+
+        Raises:
+            ValueError: If the features and values do not match.
+        """
+        if len(self.features) != len(self.values):
+            raise ValueError(f"Got {len(self.values)} values for {len(self.features)} features")
+        if len(set(self.features)) != len(self.features):
+            raise ValueError("Feature names must be unique")
+        return self
+
+def to_record(input_data: InputData) -> Dict[str, Union[str, int, float]]:
     """
-    Converts input data to a pandas DataFrame.
+    Converts input data to a feature name -> value mapping.
 
     Args:
         input_data (InputData): The input data containing features and values.
 
     Returns:
-        pd.DataFrame: A pandas DataFrame constructed from the input data.
+        Dict[str, Union[str, int, float]]: The feature values keyed by feature name.
     """
-    return pd.DataFrame([input_data.values], columns=input_data.features)
\ No newline at end of file
+    return dict(zip(input_data.features, input_data.values))
\ No newline at end of file
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
 from fetchers.model_fetcher import ModelFetcher
 from src import get_model_fetcher 
-from src.parser import InputData, to_pandas_df
+from src.parser import InputData, to_record
 from src.security import verify_api_key
 from typing import Dict
 
@@ -30,5 +30,5 @@ async def predict(input_data: InputData, model_loader: ModelFetcher = Depends(ge
         float: The prediction result from the model.
     """
     model = model_loader.get_model(input_data.model_name)
-    data = to_pandas_df(input_data=input_data)
-    return model.predict(data)[0]
+    record = to_record(input_data=input_data)
+    return float(model.predict([record])[0])
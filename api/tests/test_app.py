@@ -0,0 +1,14 @@
+import subprocess
+import sys
+from pathlib import Path
+
+API_DIR = Path(__file__).resolve().parents[1]
+
+
+def test_import_app_does_not_load_training_stack():
+    # Run in a fresh interpreter, as other tests import these modules
+    check = "import sys, app; print([m for m in ('mlflow', 'pandas', 'sklearn') if m in sys.modules])"
+
+    result = subprocess.run([sys.executable, "-c", check], cwd=API_DIR, capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == "[]"
@@ -0,0 +1,168 @@
+import numpy as np
+import os
+import pandas as pd
+import pytest
+from category_encoders import TargetEncoder
+from fetchers.compiled_model import CompiledModel
+from pathlib import Path
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, StandardScaler
+
+DATA_DIR = Path(__file__).resolve().parents[2] / "train_pipeline" / "data"
+FEATURES = ["type", "sector", "net_usable_area", "net_area", "n_rooms", "n_bathroom", "latitude", "longitude"]
+TARGET = "price"
+
+
+@pytest.fixture(scope="module")
+def train_data() -> pd.DataFrame:
+    return pd.read_csv(DATA_DIR / "train.csv")
+
+
+@pytest.fixture(scope="module")
+def test_data() -> pd.DataFrame:
+    return pd.read_csv(DATA_DIR / "test.csv")
+
+
+def fit_pipeline(train_data: pd.DataFrame, encoder: object, columns: list, remainder: str, regressor: object) -> Pipeline:
+    pipeline = Pipeline([
+        ("preprocessor", ColumnTransformer([("categorical", encoder, columns)], remainder=remainder)),
+        ("regressor", regressor),
+    ])
+    return pipeline.fit(train_data[FEATURES], train_data[TARGET])
+
+
+def gradient_boosting() -> GradientBoostingRegressor:
+    return GradientBoostingRegressor(learning_rate=0.05, n_estimators=50, max_depth=5, loss="absolute_error")
+
+
+@pytest.fixture(scope="module", params=["drop", "passthrough"])
+def pipeline(request, train_data: pd.DataFrame) -> Pipeline:
+    return fit_pipeline(train_data, TargetEncoder(), ["type", "sector"], request.param, gradient_boosting())
+
+
+def roundtrip(pipeline: Pipeline, tmp_path: Path) -> CompiledModel:
+    path = tmp_path / "model.npz"
+    CompiledModel.from_pipeline(pipeline, run_id="run").save(path)
+    assert list(tmp_path.iterdir()) == [path]
+    return CompiledModel.load(path)
+
+
+def test_predictions_match_pipeline(pipeline: Pipeline, test_data: pd.DataFrame, tmp_path: Path):
+    model = roundtrip(pipeline, tmp_path)
+
+    expected = pipeline.predict(test_data[FEATURES])
+    predicted = model.predict(test_data[FEATURES].to_dict("records"))
+
+    assert model.run_id == "run"
+    np.testing.assert_allclose(predicted, expected, rtol=1e-9)
+
+
+def test_save_uses_umask_permissions(pipeline: Pipeline, tmp_path: Path):
+    umask = os.umask(0o022)
+    try:
+        model = roundtrip(pipeline, tmp_path)
+    finally:
+        os.umask(umask)
+
+    assert model.run_id == "run"
+    assert (tmp_path / "model.npz").stat().st_mode & 0o777 == 0o644
+
+
+def test_unseen_category_matches_pipeline(pipeline: Pipeline, test_data: pd.DataFrame, tmp_path: Path):
+    model = roundtrip(pipeline, tmp_path)
+    row = dict(test_data[FEATURES].iloc[0], sector="atlantis")
+
+    expected = pipeline.predict(pd.DataFrame([row]))
+
+    np.testing.assert_allclose(model.predict([row]), expected, rtol=1e-9)
+
+
+@pytest.mark.parametrize("encoder", [TargetEncoder(cols=["type", "n_rooms"]), TargetEncoder()], ids=["encoded", "passed_through"])
+def test_numeric_categories_match_int_and_float(train_data: pd.DataFrame, test_data: pd.DataFrame, tmp_path: Path, encoder):
+    pipeline = fit_pipeline(train_data, encoder, ["type", "n_rooms"], "drop", gradient_boosting())
+    model = roundtrip(pipeline, tmp_path)
+    row = dict(test_data[FEATURES].iloc[0], n_rooms=3.0)
+
+    expected = pipeline.predict(pd.DataFrame([row]))
+
+    np.testing.assert_allclose(model.predict([row]), expected, rtol=1e-9)
+    np.testing.assert_allclose(model.predict([dict(row, n_rooms=3)]), expected, rtol=1e-9)
+
+
+@pytest.mark.parametrize("value", [float("nan"), float("inf"), "abc"])
+def test_rejects_invalid_numeric_features(train_data: pd.DataFrame, test_data: pd.DataFrame, tmp_path: Path, value):
+    pipeline = fit_pipeline(train_data, TargetEncoder(), ["type", "sector"], "passthrough", gradient_boosting())
+    model = roundtrip(pipeline, tmp_path)
+    row = dict(test_data[FEATURES].iloc[0], net_area=value)
+
+    with pytest.raises(ValueError, match="net_area"):
+        model.predict([row])
+
+
+def test_rejects_missing_features(pipeline: Pipeline, test_data: pd.DataFrame, tmp_path: Path):
+    model = roundtrip(pipeline, tmp_path)
+    row = dict(test_data[FEATURES].iloc[0])
+    del row["sector"]
+
+    with pytest.raises(ValueError, match="Missing feature: sector"):
+        model.predict([row])
+
+
+@pytest.mark.parametrize("encoder, regressor, match", [
+    (TargetEncoder(), RandomForestRegressor(n_estimators=2), "Unsupported estimator"),
+    (TargetEncoder(), GradientBoostingRegressor(n_estimators=5, init=LinearRegression()), "Unsupported initial estimator"),
+    (StandardScaler(), gradient_boosting(), "Unsupported encoder"),
+    (OneHotEncoder(), gradient_boosting(), "not one column per input"),
+])
+def test_from_pipeline_rejects_unsupported_pipelines(train_data: pd.DataFrame, encoder, regressor, match):
+    columns = ["net_area"] if isinstance(encoder, StandardScaler) else ["type", "sector"]
+    pipeline = fit_pipeline(train_data, encoder, columns, "drop", regressor)
+
+    with pytest.raises(ValueError, match=match):
+        CompiledModel.from_pipeline(pipeline, run_id="run")
+
+
+@pytest.mark.parametrize("init", ["zero", None], ids=["zero", "default"])
+def test_constant_initial_estimators_match_pipeline(train_data: pd.DataFrame, test_data: pd.DataFrame, tmp_path: Path, init):
+    regressor = GradientBoostingRegressor(n_estimators=20, init=init)
+    pipeline = fit_pipeline(train_data, TargetEncoder(), ["type", "sector"], "passthrough", regressor)
+    model = roundtrip(pipeline, tmp_path)
+
+    expected = pipeline.predict(test_data[FEATURES])
+
+    np.testing.assert_allclose(model.predict(test_data[FEATURES].to_dict("records")), expected, rtol=1e-9)
+
+
+@pytest.mark.parametrize("columns", [slice(0, 2), "type", np.array([True, True] + [False] * 6)], ids=["slice", "string", "mask"])
+def test_from_pipeline_rejects_unsupported_column_selections(train_data: pd.DataFrame, columns):
+    pipeline = fit_pipeline(train_data, TargetEncoder(), columns, "drop", gradient_boosting())
+
+    with pytest.raises(ValueError, match="Unsupported column selection"):
+        CompiledModel.from_pipeline(pipeline, run_id="run")
+
+
+def test_from_pipeline_rejects_columns_used_twice(train_data: pd.DataFrame):
+    pipeline = Pipeline([
+        ("preprocessor", ColumnTransformer([
+            ("categorical", TargetEncoder(cols=["n_rooms"]), ["n_rooms"]),
+            ("numeric", "passthrough", ["n_rooms"]),
+        ])),
+        ("regressor", gradient_boosting()),
+    ]).fit(train_data[FEATURES], train_data[TARGET])
+
+    with pytest.raises(ValueError, match="more than one transformer"):
+        CompiledModel.from_pipeline(pipeline, run_id="run")
+
+
+def test_from_pipeline_rejects_several_preprocessors(train_data: pd.DataFrame):
+    pipeline = Pipeline([
+        ("scaler", StandardScaler()),
+        ("preprocessor", ColumnTransformer([("numeric", StandardScaler(), [0])])),
+        ("regressor", gradient_boosting()),
+    ]).fit(train_data[["net_area"]], train_data[TARGET])
+
+    with pytest.raises(ValueError, match="single ColumnTransformer"):
+        CompiledModel.from_pipeline(pipeline, run_id="run")
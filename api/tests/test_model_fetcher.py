@@ -0,0 +1,138 @@
+import logging
+import numpy as np
+import pandas as pd
+import pytest
+from category_encoders import TargetEncoder
+from config import settings
+from fetchers import model_fetcher
+from fetchers.compiled_model import CompiledModel
+from fetchers.model_fetcher import ModelFetcher
+from fetchers.pipeline_model import PipelineModel
+from pathlib import Path
+from sklearn.compose import ColumnTransformer
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.pipeline import Pipeline
+from types import SimpleNamespace
+
+DATA_DIR = Path(__file__).resolve().parents[2] / "train_pipeline" / "data"
+FEATURES = ["type", "sector", "net_usable_area", "net_area", "n_rooms", "n_bathroom", "latitude", "longitude"]
+TARGET = "price"
+MODEL = "property_price"
+
+logger = logging.getLogger(__name__)
+
+
+@pytest.fixture(scope="module")
+def train_data() -> pd.DataFrame:
+    return pd.read_csv(DATA_DIR / "train.csv")
+
+
+def fit_pipeline(train_data: pd.DataFrame, regressor: object) -> Pipeline:
+    pipeline = Pipeline([
+        ("preprocessor", ColumnTransformer([("categorical", TargetEncoder(), ["type", "sector"])], remainder="passthrough")),
+        ("regressor", regressor),
+    ])
+    return pipeline.fit(train_data[FEATURES], train_data[TARGET])
+
+
+@pytest.fixture(scope="module")
+def pipeline(train_data: pd.DataFrame) -> Pipeline:
+    return fit_pipeline(train_data, GradientBoostingRegressor(n_estimators=10))
+
+
+@pytest.fixture
+def artifact_path(tmp_path: Path, monkeypatch) -> Path:
+    monkeypatch.setattr(model_fetcher, "API_ROOT", tmp_path)
+    monkeypatch.setattr(settings, "MODEL_ARTIFACTS_DIR", "artifacts")
+    monkeypatch.setattr(settings, "AVAILABLE_MODELS", [MODEL])
+    return tmp_path / "artifacts" / f"{MODEL}.npz"
+
+
+@pytest.fixture
+def mlflow(monkeypatch, pipeline: Pipeline) -> SimpleNamespace:
+    """Stands in for the MLflow server: `latest_run` is its most recent run, or the error raised when queried."""
+    fake = SimpleNamespace(latest_run={"run_id": "new", "artifact_uri": "runs:/new"}, pipeline=pipeline, queries=0, loads=0)
+
+    def latest_run(self, model):
+        fake.queries += 1
+        if isinstance(fake.latest_run, Exception):
+            raise fake.latest_run
+        return fake.latest_run
+
+    def load_from_mlflow(self, run):
+        fake.loads += 1
+        return fake.pipeline
+
+    monkeypatch.setattr(ModelFetcher, "_latest_run", latest_run)
+    monkeypatch.setattr(ModelFetcher, "_load_from_mlflow", load_from_mlflow)
+    monkeypatch.setattr(model_fetcher, "_mlflow_installed", lambda: True)
+    return fake
+
+
+def save_artifact(pipeline: Pipeline, path: Path, run_id: str) -> None:
+    CompiledModel.from_pipeline(pipeline, run_id=run_id).save(path)
+
+
+def test_serves_artifact_without_querying_mlflow(pipeline, artifact_path, mlflow):
+    save_artifact(pipeline, artifact_path, run_id="old")
+
+    model = ModelFetcher(logger=logger, check_latest_run=False).get_model(MODEL)
+
+    assert model.run_id == "old"
+    assert mlflow.queries == 0
+
+
+def test_stale_artifact_is_reexported(pipeline, artifact_path, mlflow):
+    save_artifact(pipeline, artifact_path, run_id="old")
+
+    model = ModelFetcher(logger=logger, check_latest_run=True).get_model(MODEL)
+
+    assert model.run_id == "new"
+    assert CompiledModel.load(artifact_path).run_id == "new"
+
+
+def test_up_to_date_artifact_is_not_reexported(pipeline, artifact_path, mlflow):
+    save_artifact(pipeline, artifact_path, run_id="new")
+
+    model = ModelFetcher(logger=logger, check_latest_run=True).get_model(MODEL)
+
+    assert model.run_id == "new"
+    assert mlflow.loads == 0
+
+
+def test_unreadable_artifact_is_reexported(artifact_path, mlflow):
+    artifact_path.parent.mkdir()
+    artifact_path.write_bytes(b"truncated")
+
+    model = ModelFetcher(logger=logger, check_latest_run=False).get_model(MODEL)
+
+    assert model.run_id == "new"
+    assert CompiledModel.load(artifact_path).run_id == "new"
+
+
+def test_unreachable_mlflow_serves_artifact(pipeline, artifact_path, mlflow):
+    save_artifact(pipeline, artifact_path, run_id="old")
+    mlflow.latest_run = ConnectionError("MLflow is down")
+
+    model = ModelFetcher(logger=logger, check_latest_run=True).get_model(MODEL)
+
+    assert model.run_id == "old"
+    assert mlflow.queries == 1
+
+
+def test_missing_mlflow_without_artifact_fails(artifact_path, mlflow, monkeypatch):
+    monkeypatch.setattr(model_fetcher, "_mlflow_installed", lambda: False)
+
+    with pytest.raises(Exception, match="mlflow is not installed"):
+        ModelFetcher(logger=logger)
+
+
+def test_uncompilable_pipeline_is_served_through_pipeline_model(train_data, artifact_path, mlflow):
+    mlflow.pipeline = fit_pipeline(train_data, RandomForestRegressor(n_estimators=2))
+    row = train_data[FEATURES].iloc[0].to_dict()
+
+    model = ModelFetcher(logger=logger).get_model(MODEL)
+
+    assert isinstance(model, PipelineModel)
+    assert not artifact_path.exists()
+    np.testing.assert_allclose(model.predict([row]), mlflow.pipeline.predict(pd.DataFrame([row])))
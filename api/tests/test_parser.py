@@ -0,0 +1,19 @@
+import pytest
+from pydantic import ValidationError
+from src.parser import InputData, to_record
+
+
+def test_to_record_maps_features_to_values():
+    input_data = InputData(model_name="model", features=["type", "n_rooms"], values=["casa", 3])
+
+    assert to_record(input_data=input_data) == {"type": "casa", "n_rooms": 3}
+
+
+@pytest.mark.parametrize("features, values, match", [
+    (["type", "n_rooms"], ["casa"], "Got 1 values for 2 features"),
+    (["type"], ["casa", 3], "Got 2 values for 1 features"),
+    (["type", "type"], ["casa", "departamento"], "Feature names must be unique"),
+])
+def test_input_data_rejects_mismatched_features(features, values, match):
+    with pytest.raises(ValidationError, match=match):
+        InputData(model_name="model", features=features, values=values)